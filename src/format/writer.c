@@ -1431,14 +1431,15 @@ static int write_streaming_entry(ZContext* ctx,
                                  uint64_t zip64_trigger,
                                  const zu_existing_entry* existing,
                                  uint64_t* offset,
-                                 zu_entry_list* entries) {
+                                 zu_entry_list* entries,
+                                 bool force_store) {
     if (!ctx || !stored || !info || !offset || !entries) {
         return ZU_STATUS_USAGE;
     }
 
     bool size_unknown = !info->size_known;
     uint64_t size_hint = info->size_known ? (uint64_t)info->st.st_size : 0;
-    bool compress = should_compress_file(ctx, info, path);
+    bool compress = !force_store && should_compress_file(ctx, info, path);
     if (info->size_known && info->st.st_size == 0) {
         compress = false;
     }
@@ -1731,6 +1732,17 @@ static int write_streaming_entry(ZContext* ctx,
         return rc;
     }
 
+    /* Incompressible input can come out larger than it went in. Like the staged
+       path, store it instead: rewind over this entry and write it again. */
+    uint64_t payload_size = pzc ? comp_size - 12 : comp_size;
+    if (compress && !info->is_stdin && !ctx->output_to_stdout && payload_size >= uncomp_size) {
+        if (fflush(ctx->out_file) == 0 && ftruncate(fileno(ctx->out_file), (off_t)entry_lho_offset) == 0 &&
+            fseeko(ctx->out_file, (off_t)entry_lho_offset, SEEK_SET) == 0) {
+            ctx->current_offset = entry_lho_offset;
+            return write_streaming_entry(ctx, path, stored, info, dos_time, dos_date, entry_lho_offset, entry_disk_start, zip64_trigger, existing, offset, entries, true);
+        }
+    }
+
     bool need_zip64 = header_zip64 || comp_size >= zip64_trigger || uncomp_size >= zip64_trigger || *offset >= zip64_trigger;
     if (write_data_descriptor(ctx, crc, comp_size, uncomp_size, need_zip64) != ZU_STATUS_OK) {
         return ZU_STATUS_IO;
@@ -2588,7 +2600,7 @@ int zu_modify_archive(ZContext* ctx) {
                     rc = write_stdin_staged_entry(ctx, entry_name, &info, dos_time, dos_date, entry_lho_offset, entry_disk_start, existing, &offset, &entries);
                 }
                 else {
-                    rc = write_streaming_entry(ctx, path, entry_name, &info, dos_time, dos_date, entry_lho_offset, entry_disk_start, zip64_trigger, existing, &offset, &entries);
+                    rc = write_streaming_entry(ctx, path, entry_name, &info, dos_time, dos_date, entry_lho_offset, entry_disk_start, zip64_trigger, existing, &offset, &entries, false);
                 }
                 if (rc != ZU_STATUS_OK)
                     goto cleanup;
@@ -0,0 +1,34 @@
+import subprocess
+
+
+def _default_pipesize(want=1 << 20):
+    # F_SETPIPE_SZ fails with EPERM for unprivileged callers above
+    # /proc/sys/fs/pipe-max-size (1 MiB by default), so never ask for more.
+    try:
+        with open('/proc/sys/fs/pipe-max-size') as f:
+            return min(want, int(f.read()))
+    except (OSError, ValueError):
+        return -1
+
+
+PIPESIZE = _default_pipesize()
+
+
+def run(cmd, cwd=None, input_data=None, text=True, env=None, executable=None, capture_out=True, pipesize=PIPESIZE):
+    # close_fds=False lets CPython take its posix_spawn/vfork fast path and skips the
+    # close-on-exec walk over every inherited descriptor on each spawn.
+    # capture_out=False sends stdout to /dev/null for callers that only report stderr.
+    # pipesize grows the kernel pipe buffers (F_SETPIPE_SZ) so verbose listings and
+    # large stdin payloads move in fewer wakeups; -1 keeps the system default.
+    return subprocess.run(
+        cmd,
+        cwd=cwd,
+        input=input_data,
+        env=env,
+        executable=executable,
+        stdout=subprocess.PIPE if capture_out else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=text,
+        close_fds=False,
+        pipesize=pipesize,
+    )
@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None, input_data: bytes | None = None):
-    return subprocess.run(cmd, cwd=cwd, input=input_data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=False)
+from _runner import run
 
 
 def main():
@@ -27,7 +24,7 @@ def main():
             zf.writestr(zi, 'payload')
 
         updated_comment = b"updated archive comment\nsecond line"
-        res = run([zip_bin, '-z', str(archive)], cwd=work, input_data=updated_comment)
+        res = run([zip_bin, '-z', str(archive)], cwd=work, input_data=updated_comment, text=False)
         if res.returncode != 0:
             raise SystemExit(f"zip -z edit failed: {res.stderr.decode() or res.stdout.decode()}")
 
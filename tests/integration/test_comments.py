@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None, input_data: bytes | None = None):
-    return subprocess.run(cmd, cwd=cwd, input=input_data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=False)
+from _runner import run
 
 
 def main():
@@ -23,7 +20,7 @@ def main():
 
         comment = b"archive comment\nsecond line"
         archive = work / 'commented.zip'
-        res = run([zip_bin, '-z', str(archive), f1.name], cwd=work, input_data=comment)
+        res = run([zip_bin, '-z', str(archive), f1.name], cwd=work, input_data=comment, text=False)
         if res.returncode != 0:
             raise SystemExit(f"zip -z failed: {res.stderr.decode() or res.stdout.decode()}")
 
@@ -36,7 +33,7 @@ def main():
         # Add a second file without -z and ensure the comment is preserved
         f2 = work / 'f2.txt'
         f2.write_text('second')
-        res2 = run([zip_bin, str(archive), f2.name], cwd=work)
+        res2 = run([zip_bin, str(archive), f2.name], cwd=work, text=False)
         if res2.returncode != 0:
             raise SystemExit(f"zip update failed: {res2.stderr.decode() or res2.stdout.decode()}")
 
@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import zipfile
 
-
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+from _runner import run
 
 
 def main():
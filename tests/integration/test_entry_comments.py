@@ -1,24 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None, text=True, input_data=None):
-    return subprocess.run(cmd, cwd=cwd, input=input_data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
-
-
-def make_zipnote_alias(zip_bin: str, work: Path) -> str:
-    link = work / 'zipnote'
-    if not link.exists():
-        try:
-            link.symlink_to(Path(zip_bin))
-        except OSError as exc:
-            raise SystemExit(f"failed to create zipnote alias: {exc}") from exc
-    return str(link)
+from _runner import run
 
 
 def main():
@@ -59,11 +46,10 @@ def main():
             if 'extra.txt' not in zf.namelist():
                 raise SystemExit("extra.txt missing after rewrite")
 
-        zipnote_bin = os.environ.get('ZIPNOTE_BIN')
-        if not zipnote_bin or Path(zipnote_bin).name != 'zipnote':
-            zipnote_bin = make_zipnote_alias(zip_bin, work)
+        # The binary dispatches on argv[0], so run it as 'zipnote' instead of creating an alias on disk.
+        zipnote_bin = os.environ.get('ZIPNOTE_BIN') or zip_bin
 
-        note_res = run([zipnote_bin, str(archive)], text=True)
+        note_res = run(['zipnote', str(archive)], executable=zipnote_bin, text=True)
         if note_res.returncode != 0:
             raise SystemExit(f"zipnote failed: {note_res.stderr or note_res.stdout}")
         if 'hello entry comment' not in note_res.stdout:
@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import zipfile
 
+import _runner
+
 
 def run(cmd, cwd=None):
-    res = subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    res = _runner.run(cmd, cwd=cwd)
     if res.returncode != 0:
         raise RuntimeError(f"cmd failed {cmd}: {res.stderr}")
     return res.stdout
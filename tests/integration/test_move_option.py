@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import zipfile
 
-
-def run(cmd, cwd=None, input_data: bytes | None = None):
-    return subprocess.run(cmd, cwd=cwd, input=input_data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=False)
+from _runner import run
 
 
 def main():
@@ -24,7 +21,7 @@ def main():
         b.write_text('hello move b')
 
         archive = work / 'moved.zip'
-        res = run([zip_bin, '-m', str(archive), a.name, b.name], cwd=work)
+        res = run([zip_bin, '-m', str(archive), a.name, b.name], cwd=work, text=False)
         if res.returncode != 0:
             raise SystemExit(f"zip -m failed: {res.stderr.decode() or res.stdout.decode()}")
 
@@ -40,7 +37,7 @@ def main():
 
         # Ensure stdin paths are not removed (should be skipped gracefully)
         archive2 = work / 'stdin.zip'
-        res2 = run([zip_bin, '-m', str(archive2), '-'], cwd=work, input_data=b'stdin data')
+        res2 = run([zip_bin, '-m', str(archive2), '-'], cwd=work, input_data=b'stdin data', text=False)
         if res2.returncode != 0:
             raise SystemExit(f"zip -m with stdin failed: {res2.stderr.decode() or res2.stdout.decode()}")
         with zipfile.ZipFile(archive2, 'r') as zf:
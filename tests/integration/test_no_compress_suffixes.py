@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+from _runner import run
 
 
 def main():
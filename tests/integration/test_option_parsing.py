@@ -1,21 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None, input_data: bytes | None = None, text: bool = False):
-    return subprocess.run(
-        cmd,
-        cwd=cwd,
-        input=input_data,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=text,
-    )
+from _runner import run
 
 
 def main():
@@ -30,7 +20,7 @@ def main():
         data = work / "data.txt"
         data.write_text("cluster me\n")
         archive = work / "cluster.zip"
-        res = run([zip_bin, "-rq9", str(archive), data.name], cwd=work)
+        res = run([zip_bin, "-rq9", str(archive), data.name], cwd=work, text=False)
         if res.returncode != 0:
             raise SystemExit(f"-rq9 failed: {res.stderr.decode() or res.stdout.decode()}")
         with zipfile.ZipFile(archive, "r") as zf:
@@ -46,6 +36,7 @@ def main():
         res2 = run(
             [zip_bin, "-x", "skip.txt", "--", str(archive2), keep.name, skip.name],
             cwd=work,
+            text=False,
         )
         if res2.returncode != 0:
             raise SystemExit(f"-x list parse failed: {res2.stderr.decode() or res2.stdout.decode()}")
@@ -56,7 +47,7 @@ def main():
 
         # Clustered -xpattern form should be accepted and skip matching names.
         archive3 = work / "badcluster.zip"
-        res3 = run([zip_bin, str(archive3), keep.name, skip.name, "-xskip.txt"], cwd=work)
+        res3 = run([zip_bin, str(archive3), keep.name, skip.name, "-xskip.txt"], cwd=work, text=False)
         if res3.returncode != 0:
             raise SystemExit(f"clustered -xparse failed: {res3.stderr.decode() or res3.stdout.decode()}")
         with zipfile.ZipFile(archive3, "r") as zf:
@@ -66,12 +57,12 @@ def main():
 
         # Reject the undocumented -xi combined token.
         archive4 = work / "badxi.zip"
-        res4 = run([zip_bin, "-xi", str(archive4), keep.name], cwd=work)
+        res4 = run([zip_bin, "-xi", str(archive4), keep.name], cwd=work, text=False)
         if res4.returncode == 0:
             raise SystemExit("-xi should be rejected but command succeeded")
 
         # Filter mode: no archive or inputs -> read stdin, write archive to stdout.
-        filter_out = run([zip_bin, "-q"], input_data=b"stdin-bytes\n")
+        filter_out = run([zip_bin, "-q"], input_data=b"stdin-bytes\n", text=False)
         if filter_out.returncode != 0:
             raise SystemExit(f"filter mode failed: {filter_out.stderr.decode() if filter_out.stderr else ''}")
         if not filter_out.stdout:
@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None, text=True):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+from _runner import run
 
 
 def main():
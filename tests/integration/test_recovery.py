@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import zipfile
 import sys
 
-def run(cmd, cwd=None, stdin=None):
-    return subprocess.run(cmd, cwd=cwd, input=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=False if stdin else True)
+from _runner import run
 
 def main():
     zip_bin = os.environ.get('WRITE_BIN')
@@ -102,7 +100,7 @@ def main():
         
         # create archive with data descriptor by streaming stdin
         # zip streamed.zip -
-        res = run([zip_bin, str(archive), '-'], cwd=tmp_path, stdin=input_data)
+        res = run([zip_bin, str(archive), '-'], cwd=tmp_path, input_data=input_data, text=False)
         if res.returncode != 0:
             sys.exit("Failed to create streamed zip")
 
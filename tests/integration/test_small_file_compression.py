@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
+import random
 import tempfile
 import zipfile
 from pathlib import Path
 
+from _runner import run
 
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+# Built once from a fixed seed so every run sees the same incompressible payload.
+# NUL bytes are mapped away so the writer's text sniffing lets it reach deflate,
+# which must then fall back to storing it.
+_RAND = random.Random(42).randbytes(512).replace(b"\0", b"\1")
 
 
 def main():
@@ -35,7 +38,7 @@ def main():
                 raise SystemExit("deflate should reduce tiny.txt size")
 
         noise = work / "noise.bin"
-        noise.write_bytes(os.urandom(512))
+        noise.write_bytes(_RAND)
         archive2 = work / "noise.zip"
 
         res = run([zip_bin, str(archive2), noise.name], cwd=work)
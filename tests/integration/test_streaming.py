@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import zipfile
 
+from _runner import run
+
+
+def nonempty(path) -> bool:
+    try:
+        return os.stat(path).st_size > 0
+    except FileNotFoundError:
+        return False
+
 
 def zip_bin_path() -> str:
     override = os.environ.get('WRITE_BIN')
@@ -14,10 +22,6 @@ def zip_bin_path() -> str:
     return str(Path(__file__).resolve().parents[1] / 'build' / 'zip')
 
 
-def run_zip(cmd, input_data: bytes, cwd: Path):
-    return subprocess.run(cmd, input=input_data, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=False)
-
-
 def assert_stream_archive(path: Path, expected: bytes):
     with zipfile.ZipFile(path, 'r') as zf:
         info = zf.getinfo('-')
@@ -40,15 +44,15 @@ def main():
 
         data1 = b"stream me content\n"
         archive = tmp_path / 'stream_in.zip'
-        res1 = run_zip([str(zip_path), str(archive), '-'], data1, tmp_path)
+        res1 = run([str(zip_path), str(archive), '-'], cwd=tmp_path, input_data=data1, text=False)
         if res1.returncode != 0:
             raise SystemExit(f"zip stdin->file failed: {res1.stderr.decode()}")
-        if not archive.exists() or archive.stat().st_size == 0:
+        if not nonempty(archive):
             raise SystemExit("archive file missing after stdin stream write")
         assert_stream_archive(archive, data1)
 
         data2 = b"stream me too content\n"
-        res2 = run_zip([str(zip_path), '-', '-'], data2, tmp_path)
+        res2 = run([str(zip_path), '-', '-'], cwd=tmp_path, input_data=data2, text=False)
         if res2.returncode != 0:
             raise SystemExit(f"zip stdin->stdout failed: {res2.stderr.decode()}")
         out_path = tmp_path / 'stream_out.zip'
@@ -8,39 +8,42 @@ import tempfile
 import zipfile
 from pathlib import Path
 
+from _runner import run
+
 ATTR_TAGS = {0x5455, 0x5855, 0x7875}
 
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+EXTRA_HEADER = struct.Struct("<HH")
+
 BASE_ENV = os.environ.copy()
 for var in ("ZIPOPT", "ZIP"):
     BASE_ENV.pop(var, None)
 
 
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, env=BASE_ENV, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-
 def parse_local_extra(zip_path: Path, name: str) -> bytes:
-    with open(zip_path, "rb") as f:
-        data = f.read()
     with zipfile.ZipFile(zip_path) as zf:
         info = zf.getinfo(name)
         offset = info.header_offset
-    sig, ver, flags, method, mtime, mdate, crc, csize, usize, name_len, extra_len = struct.unpack_from(
-        "<IHHHHHIIIHH", data, offset
-    )
-    if sig != 0x04034B50:
-        raise SystemExit("Invalid local header signature")
-    start = offset + 30 + name_len
-    return data[start : start + extra_len]
+    # Read only the fixed local header and its extra field rather than the whole archive.
+    fd = os.open(zip_path, os.O_RDONLY)
+    try:
+        header = os.pread(fd, LOCAL_HEADER.size, offset)
+        if len(header) != LOCAL_HEADER.size:
+            raise SystemExit("Truncated local header")
+        sig, ver, flags, method, mtime, mdate, crc, csize, usize, name_len, extra_len = LOCAL_HEADER.unpack(header)
+        if sig != 0x04034B50:
+            raise SystemExit("Invalid local header signature")
+        return os.pread(fd, extra_len, offset + LOCAL_HEADER.size + name_len)
+    finally:
+        os.close(fd)
 
 
 def extra_tags(extra: bytes):
     tags = []
     pos = 0
-    while pos + 4 <= len(extra):
-        tag = int.from_bytes(extra[pos : pos + 2], "little")
-        size = int.from_bytes(extra[pos + 2 : pos + 4], "little")
-        end = pos + 4 + size
+    while pos + EXTRA_HEADER.size <= len(extra):
+        tag, size = EXTRA_HEADER.unpack_from(extra, pos)
+        end = pos + EXTRA_HEADER.size + size
         if end > len(extra):
             break
         tags.append(tag)
@@ -76,7 +79,7 @@ def main():
         (tmp_path / "keep.txt").write_text("keep")
         base = tmp_path / "base.zip"
 
-        res = run([sys_zip, str(base), "keep.txt"], cwd=tmp_path)
+        res = run([sys_zip, str(base), "keep.txt"], cwd=tmp_path, env=BASE_ENV)
         if res.returncode != 0:
             raise SystemExit(f"system zip failed: {res.stderr}")
 
@@ -86,7 +89,7 @@ def main():
             raise SystemExit("system zip did not add expected attribute extras")
 
         (tmp_path / "add.txt").write_text("add")
-        res = run([write_bin, "-X", str(base), "add.txt"], cwd=tmp_path)
+        res = run([write_bin, "-X", str(base), "add.txt"], cwd=tmp_path, env=BASE_ENV)
         if res.returncode != 0:
             raise SystemExit(f"zip -X failed: {res.stderr}")
 
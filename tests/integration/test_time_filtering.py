@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
-import time
 import zipfile
+from datetime import datetime
 from pathlib import Path
 
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+from _runner import run
+
+# Local-time midnights, matching the local-time -t/-tt dates passed to zip
+T_2020_01_01 = int(datetime(2020, 1, 1).timestamp())
+T_2025_01_01 = int(datetime(2025, 1, 1).timestamp())
 
 def main():
     zip_bin = os.environ.get('WRITE_BIN')
@@ -20,13 +22,11 @@ def main():
         
         f1 = tmp_path / 'old.txt'
         f1.write_text('old')
-        t1 = time.mktime(time.strptime("2020-01-01", "%Y-%m-%d"))
-        os.utime(f1, (t1, t1))
+        os.utime(f1, (T_2020_01_01, T_2020_01_01))
         
         f2 = tmp_path / 'new.txt'
         f2.write_text('new')
-        t2 = time.mktime(time.strptime("2025-01-01", "%Y-%m-%d"))
-        os.utime(f2, (t2, t2))
+        os.utime(f2, (T_2025_01_01, T_2025_01_01))
         
         # Test -t (After)
         # Should include new.txt, exclude old.txt
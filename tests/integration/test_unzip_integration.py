@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 
+import hashlib
 import os
 import stat
-import subprocess
 import tempfile
 from pathlib import Path
 from datetime import datetime
 
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+from _runner import run
+
+EXPECTED_DIGESTS = {
+    'src/a.txt': hashlib.blake2b(b'alpha\n').digest(),
+    'src/nested/b.txt': hashlib.blake2b(b'beta\n').digest(),
+}
+
 
 def test_attr_restoration(zip_bin, unzip_bin, tmp_path):
     test_file_name = 'perms_test.txt'
@@ -43,7 +48,7 @@ def main():
         test_file_name, test_file_path_src, original_perms, original_mtime_ts, original_content = test_attr_restoration(zip_bin, unzip_bin, tmp_path)
 
         archive = tmp_path / 'sample.zip'
-        create = run([zip_bin, '-r', str(archive), 'src'], cwd=tmp_path)
+        create = run([zip_bin, '-r', str(archive), 'src'], cwd=tmp_path, capture_out=False)
         if create.returncode != 0:
             raise SystemExit(f"zip creation failed: {create.stderr}")
 
@@ -63,10 +68,14 @@ def main():
 
         if not a_path.exists() or not b_path.exists() or not extracted_test_file_path.exists():
             raise SystemExit("extracted files missing")
-        if a_path.read_text() != 'alpha\n' or b_path.read_text() != 'beta\n':
-            raise SystemExit("extracted content mismatch")
-        if extracted_test_file_path.read_text() != original_content:
-            raise SystemExit("extracted test file content mismatch")
+        # The payloads are a few bytes, so read them whole and show them on failure.
+        for rel, digest in EXPECTED_DIGESTS.items():
+            data = (dest / rel).read_bytes()
+            if hashlib.blake2b(data).digest() != digest:
+                raise SystemExit(f"extracted content mismatch: {rel}: got {data!r}")
+        data = extracted_test_file_path.read_bytes()
+        if hashlib.blake2b(data).digest() != hashlib.blake2b(original_content.encode()).digest():
+            raise SystemExit(f"extracted test file content mismatch: expected {original_content!r}, got {data!r}")
 
         # Verify permissions
         extracted_stat = os.stat(extracted_test_file_path)
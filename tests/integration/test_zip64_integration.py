@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 
+import io
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 import zipfile
 
+from _runner import run
 
-def run(cmd, cwd=None, env=None):
-    return subprocess.run(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+# Zip64 EOCD record (56) + locator (20) + EOCD (22) + max archive comment (65535).
+# Both Zip64 trailer records live inside this window at the end of the archive.
+ZIP64_TAIL_WINDOW = 56 + 20 + 22 + 0xFFFF
 
 
 def parse_zip64_extra(extra):
@@ -25,11 +27,6 @@ def parse_zip64_extra(extra):
     return False
 
 
-def has_signature(blob, signature):
-    sig_bytes = signature.to_bytes(4, 'little')
-    return sig_bytes in blob
-
-
 def main():
     zip_bin = os.environ.get('WRITE_BIN')
     if zip_bin is None:
@@ -48,15 +45,16 @@ def main():
         archive = tmp_path / 'zip64.zip'
         env = os.environ.copy()
         env['ZU_TEST_ZIP64_TRIGGER'] = '1'
-        res = run([zip_bin, str(archive), 'data.txt'], cwd=tmp_path, env=env)
+        res = run([zip_bin, str(archive), 'data.txt'], cwd=tmp_path, env=env, capture_out=False)
         if res.returncode != 0:
             raise SystemExit(f"zip creation failed: {res.stderr}")
 
         blob = archive.read_bytes()
-        if not (has_signature(blob, 0x06064B50) and has_signature(blob, 0x07064B50)):
+        tail = blob[-ZIP64_TAIL_WINDOW:]
+        if tail.rfind(b'PK\x06\x06') < 0 or tail.rfind(b'PK\x06\x07') < 0:
             raise SystemExit("Zip64 EOCD or locator missing")
 
-        with zipfile.ZipFile(archive, 'r') as zf:
+        with zipfile.ZipFile(io.BytesIO(blob), 'r') as zf:
             info = zf.getinfo('data.txt')
             if not parse_zip64_extra(info.extra):
                 raise SystemExit("Zip64 extra missing from central header")
@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 
+import hashlib
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 
+from _runner import run
 
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+# The payload is a sparse all-zero file; probe only its head and tail instead of
+# reading gigabytes back, which still catches truncated or corrupted tails.
+PROBE_SIZE = 64 * 1024
 
 
 def requires_env():
@@ -22,6 +24,19 @@ def expect_signatures(path: Path):
         raise SystemExit("zip64 signatures missing")
 
 
+def head_tail_hash(path: Path, size: int) -> str:
+    probe = min(PROBE_SIZE, size)
+    with open(path, 'rb') as f:
+        head = f.read(probe)
+        f.seek(size - probe)
+        tail = f.read(probe)
+    return hashlib.blake2b(head + tail, digest_size=16).hexdigest()
+
+
+def expected_head_tail_hash(size: int) -> str:
+    return hashlib.blake2b(bytes(2 * min(PROBE_SIZE, size)), digest_size=16).hexdigest()
+
+
 def main():
     if not requires_env():
         print("skipping large Zip64 test (set ZU_RUN_LARGE_TESTS=1 to enable)")
@@ -62,10 +77,14 @@ def main():
             raise SystemExit(f"unzip extract failed: {extract_res.stderr or extract_res.stdout}")
 
         out_file = out_dir / 'large.bin'
-        if not out_file.exists():
+        try:
+            out_size = os.stat(out_file).st_size
+        except FileNotFoundError:
             raise SystemExit("extracted file missing")
-        if out_file.stat().st_size != target_size:
-            raise SystemExit(f"extracted size mismatch: expected {target_size}, got {out_file.stat().st_size}")
+        if out_size != target_size:
+            raise SystemExit(f"extracted size mismatch: expected {target_size}, got {out_size}")
+        if head_tail_hash(out_file, out_size) != expected_head_tail_hash(target_size):
+            raise SystemExit("extracted content mismatch in head/tail probe")
 
 
 if __name__ == '__main__':
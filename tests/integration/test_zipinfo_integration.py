@@ -6,16 +6,14 @@ import tempfile
 from pathlib import Path
 import zipfile
 
+from _runner import run
+
 
 BASE_ENV = os.environ.copy()
 for var in ("ZIPOPT", "ZIP", "UNZIPOPT", "ZIPINFO"):
     BASE_ENV.pop(var, None)
 
 
-def run(cmd, cwd=None):
-    return subprocess.run(cmd, cwd=cwd, env=BASE_ENV, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-
 def main():
     zip_bin = os.environ.get("ZIP_BIN", "zip")
     zipinfo_bin = os.environ.get("ZIPINFO_BIN")
@@ -38,23 +36,20 @@ def main():
         (tmp_path / "dir" / "blob.bin").write_bytes(b"\x00\x01\x02\x03")
         archive = tmp_path / "sample.zip"
 
-        create = run([zip_bin, "-r", str(archive), "dir"], cwd=tmp_path)
+        create = run([zip_bin, "-r", str(archive), "dir"], cwd=tmp_path, env=BASE_ENV, capture_out=False)
         if create.returncode != 0:
             raise SystemExit(f"zip creation failed: {create.stderr}")
-        comment_res = subprocess.run(
+        comment_res = run(
             [zip_bin, "-z", str(archive)],
             cwd=tmp_path,
-            input="zipinfo archive comment\n",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            input_data="zipinfo archive comment\n",
             env=BASE_ENV,
         )
         if comment_res.returncode != 0:
             raise SystemExit(f"zip comment failed: {comment_res.stderr}")
 
         # Default zipinfo listing should include header, entries, and totals.
-        res = run([zipinfo_bin, "-Z", str(archive)])
+        res = run([zipinfo_bin, "-Z", str(archive)], env=BASE_ENV)
         if res.returncode != 0:
             raise SystemExit(f"zipinfo default failed: {res.stderr or res.stdout}")
         lines = [ln for ln in res.stdout.strip().splitlines() if ln.strip()]
@@ -76,17 +71,21 @@ def main():
             raise SystemExit(f"expected binary flag for blob.bin, saw {flags.get('dir/blob.bin')}")
 
         # -1 should emit names only, one per line, with no header/footer.
-        names_out = run([zipinfo_bin, "-Z", "-1", str(archive)])
-        if names_out.returncode != 0:
-            raise SystemExit(f"zipinfo -1 failed: {names_out.stderr or names_out.stdout}")
-        names = [ln for ln in names_out.stdout.strip().splitlines() if ln]
+        # The pager flag (-M) must be a no-op in non-tty contexts, so the
+        # names-only output has to come through untouched with it as well.
         with zipfile.ZipFile(archive) as zf:
             expected = sorted(zf.namelist())
-        if sorted(names) != expected:
-            raise SystemExit(f"zipinfo -1 mismatch\nexpected: {expected}\nactual:   {names}")
+        for flags in (["-1"], ["-M", "-1"]):
+            label = " ".join(flags)
+            names_out = run([zipinfo_bin, "-Z", *flags, str(archive)], env=BASE_ENV)
+            if names_out.returncode != 0:
+                raise SystemExit(f"zipinfo {label} failed: {names_out.stderr or names_out.stdout}")
+            names = [ln for ln in names_out.stdout.strip().splitlines() if ln]
+            if sorted(names) != expected:
+                raise SystemExit(f"zipinfo {label} mismatch\nexpected: {expected}\nactual:   {names}")
 
         # -t alone should print only the totals footer.
-        totals_out = run([zipinfo_bin, "-Z", "-t", str(archive)])
+        totals_out = run([zipinfo_bin, "-Z", "-t", str(archive)], env=BASE_ENV)
         if totals_out.returncode != 0:
             raise SystemExit(f"zipinfo -t failed: {totals_out.stderr or totals_out.stdout}")
         totals_lines = [ln for ln in totals_out.stdout.strip().splitlines() if ln.strip()]
@@ -94,7 +93,7 @@ def main():
             raise SystemExit(f"zipinfo -t unexpected output: {totals_out.stdout}")
 
         # Verbose should show extra fields and archive comment.
-        verbose = run([zipinfo_bin, "-Z", "-v", str(archive)])
+        verbose = run([zipinfo_bin, "-Z", "-v", str(archive)], env=BASE_ENV)
         if verbose.returncode != 0:
             raise SystemExit(f"zipinfo -v failed: {verbose.stderr or verbose.stdout}")
         if not is_zip_utils and ("extra fields" not in verbose.stdout or "tag 0x" not in verbose.stdout):
@@ -102,11 +101,6 @@ def main():
         if "zipfile comment" not in verbose.stdout:
             raise SystemExit("zipinfo -v missing archive comment header")
 
-        # Pager flag should be a no-op in non-tty contexts.
-        pager = run([zipinfo_bin, "-Z", "-M", "-1", str(archive)])
-        if pager.returncode != 0:
-            raise SystemExit(f"zipinfo -M failed: {pager.stderr or pager.stdout}")
-
 
 if __name__ == "__main__":
     main()
@@ -1,24 +1,11 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 
-
-def run(cmd, cwd=None, text=True, input_data=None):
-    return subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text, input=input_data)
-
-
-def make_zipnote_alias(zip_bin: str, work: Path) -> str:
-    link = work / 'zipnote'
-    if not link.exists():
-        try:
-            link.symlink_to(Path(zip_bin))
-        except OSError as exc:
-            raise SystemExit(f"failed to create zipnote alias: {exc}") from exc
-    return str(link)
+from _runner import run
 
 
 def main():
@@ -36,9 +23,8 @@ def main():
             zf.writestr(info1, 'payload1')
             zf.writestr('file2.txt', 'payload2')
 
-        zipnote_bin = os.environ.get('ZIPNOTE_BIN')
-        if not zipnote_bin or Path(zipnote_bin).name != 'zipnote':
-            zipnote_bin = make_zipnote_alias(zip_bin, work)
+        # The binary dispatches on argv[0], so run it as 'zipnote' instead of creating an alias on disk.
+        zipnote_bin = os.environ.get('ZIPNOTE_BIN') or zip_bin
 
         note_text = """@ file1.txt
 new comment 1
@@ -51,7 +37,7 @@ second comment
 archive note
 @
 """
-        apply_res = run([zipnote_bin, '-w', str(archive)], cwd=work, input_data=note_text, text=True)
+        apply_res = run(['zipnote', '-w', str(archive)], executable=zipnote_bin, cwd=work, input_data=note_text, text=True)
         if apply_res.returncode != 0:
             raise SystemExit(f"zipnote -w failed: {apply_res.stderr or apply_res.stdout}")
 
@@ -65,7 +51,7 @@ archive note
             if zf.comment != b'archive note\n':
                 raise SystemExit(f"archive comment mismatch: {zf.comment!r}")
 
-        list_res = run([zipnote_bin, str(archive)], cwd=work, text=True)
+        list_res = run(['zipnote', str(archive)], executable=zipnote_bin, cwd=work, text=True)
         if list_res.returncode != 0:
             raise SystemExit(f"zipnote list failed: {list_res.stderr or list_res.stdout}")
         if '@ file1.txt' not in list_res.stdout or '@ file2.txt' not in list_res.stdout:
@@ -9,6 +9,7 @@
 #include <unistd.h>
 #include <sys/stat.h>
 #include <limits.h>
+#include <zlib.h>
 
 #include "ctx.h"
 #include "fileio.h"
@@ -180,10 +181,149 @@ static int test_basic_create(void) {
     return 0;
 }
 
+static uint16_t rd16(const unsigned char* p) {
+    return (uint16_t)(p[0] | (p[1] << 8));
+}
+
+static uint32_t rd32(const unsigned char* p) {
+    return (uint32_t)p[0] | ((uint32_t)p[1] << 8) | ((uint32_t)p[2] << 16) | ((uint32_t)p[3] << 24);
+}
+
+/* A streamed entry that deflate would enlarge must be rewritten as stored,
+   with nothing left over from the discarded deflate attempt. */
+static int test_stream_store_on_expansion(void) {
+    ZContext* ctx = zu_context_create();
+    if (!ctx) {
+        fprintf(stderr, "ctx alloc failed\n");
+        return 1;
+    }
+
+    char template[] = "/tmp/zu_writer_testXXXXXX";
+    if (!mkdtemp(template)) {
+        perror("mkdtemp");
+        zu_context_free(ctx);
+        return 1;
+    }
+
+    char orig_cwd[PATH_MAX];
+    if (!getcwd(orig_cwd, sizeof(orig_cwd)) || chdir(template) != 0) {
+        perror("chdir");
+        cleanup_temp_dir(template);
+        zu_context_free(ctx);
+        return 1;
+    }
+
+    /* NUL-free noise: text sniffing lets it through to deflate, which expands it */
+    unsigned char payload[512];
+    uint32_t seed = 42;
+    for (size_t i = 0; i < sizeof(payload); i++) {
+        seed = seed * 1103515245u + 12345u;
+        payload[i] = (unsigned char)(1 + (seed >> 16) % 255);
+    }
+    FILE* fp = fopen("b.bin", "wb");
+    if (!fp || fwrite(payload, 1, sizeof(payload), fp) != sizeof(payload)) {
+        fprintf(stderr, "failed to create test file\n");
+        if (fp)
+            fclose(fp);
+        chdir(orig_cwd);
+        cleanup_temp_dir(template);
+        zu_context_free(ctx);
+        return 1;
+    }
+    fclose(fp);
+
+    ctx->archive_path = "test.zip";
+    ctx->store_paths = true;
+    ctx->quiet = true;
+    ctx->fast_write = true; /* regular files go through write_streaming_entry */
+
+    int failed = 1;
+    unsigned char* blob = NULL;
+    if (zu_strlist_push(&ctx->include, "b.bin") != 0) {
+        fprintf(stderr, "failed to push to include list\n");
+        goto done;
+    }
+
+    int rc = zu_modify_archive(ctx);
+    if (rc != ZU_STATUS_OK) {
+        fprintf(stderr, "zu_modify_archive failed: %d\n", rc);
+        goto done;
+    }
+
+    rc = zu_load_central_directory(ctx);
+    if (rc != ZU_STATUS_OK || ctx->existing_entries.len != 1) {
+        fprintf(stderr, "expected 1 entry after reload (rc=%d)\n", rc);
+        goto done;
+    }
+    zu_existing_entry* entry = (zu_existing_entry*)ctx->existing_entries.items[0];
+    uint32_t want_crc = (uint32_t)crc32(0L, payload, sizeof(payload));
+    if (entry->hdr.method != 0 || entry->comp_size != sizeof(payload) || entry->uncomp_size != sizeof(payload) || entry->hdr.crc32 != want_crc) {
+        fprintf(stderr, "expected stored entry: method=%u comp=%llu uncomp=%llu crc=%08x (want %08x)\n", (unsigned)entry->hdr.method,
+                (unsigned long long)entry->comp_size, (unsigned long long)entry->uncomp_size, (unsigned)entry->hdr.crc32, (unsigned)want_crc);
+        goto done;
+    }
+
+    /* Walk the raw file: local header, stored data, data descriptor, then the
+       central directory must start immediately and the EOCD must end the file. */
+    struct stat st;
+    if (stat("test.zip", &st) != 0 || (blob = malloc((size_t)st.st_size)) == NULL) {
+        fprintf(stderr, "failed to stat archive\n");
+        goto done;
+    }
+    fp = fopen("test.zip", "rb");
+    size_t size = fp ? fread(blob, 1, (size_t)st.st_size, fp) : 0;
+    if (fp)
+        fclose(fp);
+    if (size != (size_t)st.st_size || size < 30 + 22) {
+        fprintf(stderr, "failed to read archive\n");
+        goto done;
+    }
+
+    size_t data_off = 30 + (size_t)rd16(blob + 26) + (size_t)rd16(blob + 28);
+    size_t desc_off = data_off + sizeof(payload);
+    size_t cd_off = desc_off + 16;
+    size_t eocd_off = size - 22;
+    if (rd32(blob) != 0x04034b50u || rd16(blob + 8) != 0 || cd_off + 4 > eocd_off) {
+        fprintf(stderr, "local header is not a stored entry\n");
+        goto done;
+    }
+    if (memcmp(blob + data_off, payload, sizeof(payload)) != 0) {
+        fprintf(stderr, "stored data does not match input\n");
+        goto done;
+    }
+    if (rd32(blob + desc_off) != 0x08074b50u || rd32(blob + desc_off + 4) != want_crc || rd32(blob + desc_off + 8) != sizeof(payload)) {
+        fprintf(stderr, "data descriptor missing or wrong after stored data\n");
+        goto done;
+    }
+    if (rd32(blob + cd_off) != 0x02014b50u || rd32(blob + eocd_off) != 0x06054b50u) {
+        fprintf(stderr, "central directory does not follow the entry directly\n");
+        goto done;
+    }
+    if (rd32(blob + eocd_off + 16) != cd_off || cd_off + rd32(blob + eocd_off + 12) != eocd_off) {
+        fprintf(stderr, "leftover bytes between entry, central directory and EOCD\n");
+        goto done;
+    }
+
+    failed = 0;
+
+done:
+    free(blob);
+    if (chdir(orig_cwd) != 0) {
+        perror("chdir back");
+        failed = 1;
+    }
+    cleanup_temp_dir(template);
+    zu_context_free(ctx);
+    return failed;
+}
+
 int main(void) {
     if (test_basic_create() != 0) {
         return 1;
     }
+    if (test_stream_store_on_expansion() != 0) {
+        return 1;
+    }
     printf("All writer tests passed\n");
     return 0;
 }
\ No newline at end of file
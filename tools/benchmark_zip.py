@@ -6,11 +6,17 @@ This script runs a suite of performance benchmarks to compare
 the speed and compression ratio of the system's Info-ZIP `zip` command
 with the project's `build/zip` executable.
 
+Each (dataset, level) pair is timed as the best of three trials. The trials
+run concurrently, each against its own snapshot of the dataset, so the
+reported time is a best-case figure and assumes enough idle cores to avoid
+contention between trials.
+
 Usage:
-    ./benchmark_zip.py [--output <file>]
+    ./benchmark_zip.py [--output <file>] [--cold-cache]
 
 Options:
     --output <file> Write detailed results as JSON to the specified file
+    --cold-cache    Drop the page cache before each timed run (requires root)
 
 Environment variables:
     SYSTEM_ZIP: path to system zip executable (default 'zip')
@@ -18,6 +24,7 @@ Environment variables:
 """
 
 import argparse
+import asyncio
 import os
 import subprocess
 import tempfile
@@ -30,6 +37,31 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import List, Tuple, Optional
 
+TRIALS = 3
+
+async def timed_run(cmd: List[str], cwd: Path, outputs: List[Path], slots: asyncio.Semaphore) -> float:
+    """Run one trial in its own dataset snapshot and return its wall time."""
+    for out in outputs:
+        if out.exists(): out.unlink()
+    async with slots:
+        start = time.perf_counter()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=str(cwd), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        await proc.wait()
+        return time.perf_counter() - start
+
+async def best_of(cmds: List[Tuple[List[str], Path, List[Path]]]) -> float:
+    """Launch every trial on one event loop, at most one per core, and keep the fastest."""
+    slots = asyncio.Semaphore(min(len(cmds), os.cpu_count() or 1))
+    times = await asyncio.gather(*(timed_run(cmd, cwd, outputs, slots) for cmd, cwd, outputs in cmds))
+    return min(times)
+
+def drop_page_cache():
+    """Flush dirty pages and drop the page cache so the next run starts cold."""
+    subprocess.run(["sync"], check=False)
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3")
+
 @dataclass
 class PerformanceResult:
     dataset: str
@@ -42,9 +74,14 @@ class PerformanceResult:
     size_ratio: float  # system_size / build_size
 
 class ZipBenchmark:
-    def __init__(self, system_zip: str, build_zip: str):
-        self.system_zip = shutil.which(system_zip) or system_zip
+    def __init__(self, system_zip: str, build_zip: str, cold_cache: bool = False):
+        # main() hands over an already-resolved path; only walk PATH for bare names
+        if os.path.isabs(system_zip):
+            self.system_zip = system_zip
+        else:
+            self.system_zip = shutil.which(system_zip) or system_zip
         self.build_zip = str(Path(build_zip).resolve())
+        self.cold_cache = cold_cache
 
     # --- Dataset Generators ---
 
@@ -53,67 +90,71 @@ class ZipBenchmark:
         src_root = root / "src"
         src_root.mkdir()
         code_snippets = [
-            "import sys\nimport os\n\ndef main():\n    print('hello')\n",
-            "#include <stdio.h>\nint main() { return 0; }\n",
-            "const x = 1;\nfunction test() { return true; }\n"
+            b"import sys\nimport os\n\ndef main():\n    print('hello')\n",
+            b"#include <stdio.h>\nint main() { return 0; }\n",
+            b"const x = 1;\nfunction test() { return true; }\n"
         ]
         for i in range(50):
             d = src_root / f"dir_{i % 5}"
             d.mkdir(exist_ok=True)
             f = d / f"module_{i}.py"
             content = (random.choice(code_snippets) * random.randint(1, 10))
-            f.write_text(content)
+            f.write_bytes(content)
 
     def create_log_dataset(self, root: Path):
         """Simulates logs: large files, highly repetitive/compressible text."""
         log_root = root / "logs"
         log_root.mkdir()
-        line = "2025-01-01 12:00:00 [INFO] Request ID: 12345 received from IP 192.168.1.1\n"
-        content = line * 50000  # ~4MB per file
+        line = b"2025-01-01 12:00:00 [INFO] Request ID: 12345 received from IP 192.168.1.1\n"
+        content = line * 50000  # ~4MB per file, encoded once
         for i in range(3):
-            (log_root / f"server_{i}.log").write_text(content)
+            (log_root / f"server_{i}.log").write_bytes(content)
 
     def create_binary_dataset(self, root: Path):
         """Simulates binary data: random bytes, incompressible."""
         bin_root = root / "bin"
         bin_root.mkdir()
-        # 3 files, 2MB each
+        # 3 files, 2MB each, sliced from a single urandom draw
+        size = 2 * 1024 * 1024
+        pool = memoryview(os.urandom(3 * size))
         for i in range(3):
-            (bin_root / f"data_{i}.dat").write_bytes(os.urandom(2 * 1024 * 1024))
+            (bin_root / f"data_{i}.dat").write_bytes(pool[i * size:(i + 1) * size])
 
     def create_media_dataset(self, root: Path):
         """Simulates media: moderate size files, mostly incompressible."""
         media_root = root / "media"
         media_root.mkdir()
-        # 10 files, 500KB each
+        # 10 files, 500KB each, sliced from a single urandom draw
+        size = 500 * 1024
+        pool = memoryview(os.urandom(10 * size))
         for i in range(10):
-            (media_root / f"image_{i}.jpg").write_bytes(os.urandom(500 * 1024))
+            (media_root / f"image_{i}.jpg").write_bytes(pool[i * size:(i + 1) * size])
 
     # --- Performance Benchmarks ---
 
-    def run_benchmark(self, dataset_name: str, level: int, work_dir: Path) -> PerformanceResult:
-        sys_zip = work_dir / "sys.zip"
-        bld_zip = work_dir / "bld.zip"
+    def run_benchmark(self, dataset_name: str, level: int, trial_dirs: List[Path]) -> PerformanceResult:
         args = [f"-{level}", "-r", "."]
 
-        def time_it(cmd):
-            times = []
-            for _ in range(3):
-                if sys_zip.exists(): sys_zip.unlink()
-                if bld_zip.exists(): bld_zip.unlink()
-                start = time.perf_counter()
-                subprocess.run(cmd, cwd=str(work_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                times.append(time.perf_counter() - start)
-            return min(times) # Best time
-
-        sys_cmd = [self.system_zip, str(sys_zip)] + args
-        bld_cmd = [self.build_zip, str(bld_zip)] + args
-
-        sys_t = time_it(sys_cmd)
-        sys_sz = sys_zip.stat().st_size
-
-        bld_t = time_it(bld_cmd)
-        bld_sz = bld_zip.stat().st_size
+        def time_it(binary, archive_name):
+            cmds = []
+            for trial in trial_dirs:
+                outputs = [trial / "sys.zip", trial / "bld.zip"]
+                cmds.append(([binary, str(trial / archive_name)] + args, trial, outputs))
+            if self.cold_cache:
+                # Trial dirs hardlink the same inodes, so concurrent trials would warm
+                # the cache for each other; run them one at a time, each from cold.
+                times = []
+                for cmd in cmds:
+                    drop_page_cache()
+                    times.append(asyncio.run(best_of([cmd])))
+                return min(times) # Best time
+            return asyncio.run(best_of(cmds)) # Best time
+
+        sys_t = time_it(self.system_zip, "sys.zip")
+        sys_sz = (trial_dirs[0] / "sys.zip").stat().st_size
+
+        bld_t = time_it(self.build_zip, "bld.zip")
+        bld_sz = (trial_dirs[0] / "bld.zip").stat().st_size
 
         return PerformanceResult(
             dataset=dataset_name,
@@ -136,19 +177,30 @@ class ZipBenchmark:
         ]
 
         with tempfile.TemporaryDirectory() as tmp:
-            root = Path(tmp)
+            base = Path(tmp)
+            root = base / "dataset"
+            root.mkdir()
+            trial_dirs = [base / f"trial_{i}" for i in range(TRIALS)]
 
             for name, generator in datasets:
                 print(f"Generating dataset: {name}...", file=sys.stderr)
                 # Clear and generate
-                for item in root.iterdir():
-                    if item.is_file(): item.unlink()
-                    else: shutil.rmtree(item)
+                with os.scandir(root) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False): shutil.rmtree(entry.path)
+                        else: os.unlink(entry.path)
                 generator(root)
 
+                # Give every concurrent trial a private snapshot of the tree to archive.
+                # Hardlinks share the generated data, so every trial and level reads
+                # the same inodes and the snapshot costs no data copies.
+                for trial in trial_dirs:
+                    if trial.exists(): shutil.rmtree(trial)
+                    shutil.copytree(root, trial, copy_function=os.link)
+
                 for level in [1, 6, 9]:
                     print(f"  Benchmark {name} level {level}...", file=sys.stderr)
-                    res = self.run_benchmark(name, level, root)
+                    res = self.run_benchmark(name, level, trial_dirs)
                     results.append(res)
 
         return results
@@ -156,17 +208,23 @@ class ZipBenchmark:
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--output', type=str)
+    parser.add_argument('--cold-cache', action='store_true',
+                        help='drop the page cache before each timed run (requires root)')
     args = parser.parse_args()
 
     sys_zip = os.environ.get('SYSTEM_ZIP', 'zip')
     bld_zip = os.environ.get('BUILD_ZIP', 'build/zip')
 
-    if not shutil.which(sys_zip):
+    resolved_sys = shutil.which(sys_zip)
+    if not resolved_sys:
         sys.exit(f"System zip '{sys_zip}' not found.")
-    if not Path(bld_zip).exists():
+    if not os.path.isfile(bld_zip):
         sys.exit(f"Build zip '{bld_zip}' not found.")
 
-    bench = ZipBenchmark(sys_zip, bld_zip)
+    if args.cold_cache and os.geteuid() != 0:
+        sys.exit("--cold-cache requires root to write /proc/sys/vm/drop_caches.")
+
+    bench = ZipBenchmark(resolved_sys, bld_zip, cold_cache=args.cold_cache)
     
     res = bench.run_performance_suite()
     
@@ -1,38 +1,101 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import json
+import os
+import re
 import shlex
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, repeat
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+@dataclass(frozen=True, slots=True)
+class TestCase:
+    name: str
+    tool_env: str
+    args: str
+    expected_rc: int
+    expected_stdout: bytes
+    expected_stderr: bytes
+
+
+# C string-literal spelling for every byte value, as a str.translate table over
+# latin-1-decoded UTF-8 so each code point below 256 stands for exactly one byte.
+_C_ESCAPES = {n: chr(n) if 32 <= n <= 126 else f"\\{n:03o}" for n in range(256)}
+_C_ESCAPES.update({ord("\\"): "\\\\", ord('"'): '\\"', ord("\n"): "\\n", ord("\r"): "\\r", ord("\t"): "\\t"})
+
+# Anything outside printable ASCII, plus '"' and '\\'.
+_NEEDS_ESCAPE = re.compile(r'[^ !#-\[\]-~]')
+
+# Checked in this order over the whole command path: zipinfo, then unzip, then zip.
+_TOOL_ENVS = ("ZIPINFO_BIN", "UNZIP_BIN", "ZIP_BIN")
+_TOOL_NAMES = ("zipinfo", "unzip", "zip")
+
+# Tests that require stateful fixtures not supported by create_fixture
+_SKIP_TESTS = frozenset({"15-delete-filtered_cmd1", "25-pattern-brackets_cmd0"})
+
+# Below this much combined input, starting worker processes costs more than parsing serially.
+_PARALLEL_MIN_BYTES = 4 << 20
+
+
+_TEST_CASE_FMT = (
+    "    {{\n"
+    "        .name = {name},\n"
+    "        .tool_env = {tool_env},\n"
+    "        .args = {args},\n"
+    "        .expected_rc = {expected_rc},\n"
+    "        .expected_stdout = {expected_stdout},\n"
+    "        .expected_stderr = {expected_stderr},\n"
+    "    }},\n"
+)
+
+
+# tool_env, empty outputs and common names repeat across thousands of rows.
+@functools.lru_cache(maxsize=4096)
 def c_escape(s):
     if s is None:
         return "NULL"
 
-    if not isinstance(s, str):
-        s = str(s)
+    if isinstance(s, bytes):
+        # Expected outputs arrive already encoded and clamped by clamp_bytes().
+        data = s
+    else:
+        if not isinstance(s, str):
+            s = str(s)
+
+        # Names, env vars and most args are plain ASCII and can be wrapped as-is.
+        if _NEEDS_ESCAPE.search(s) is None:
+            return '"' + s + '"'
+
+        data = s.encode("utf-8", errors="replace")
+    return '"' + data.decode("latin-1").translate(_C_ESCAPES) + '"'
+
+
+@functools.lru_cache(maxsize=None)
+def tool_env_for(tool):
+    tool_l = tool.lower()
+    for name, env_var in zip(_TOOL_NAMES, _TOOL_ENVS):
+        if name in tool_l:
+            return env_var
+    return "TOOL_BIN"
+
 
-    if len(s) > 1000:
-        s = s[:1000]
-
-    out = []
-    for ch in s:
-        n = ord(ch)
-        if 32 <= n <= 126 and ch not in ('"', "\\"):
-            out.append(ch)
-        elif ch == "\\":
-            out.append("\\\\")
-        elif ch == '"':
-            out.append('\\"')
-        elif ch == "\n":
-            out.append("\\n")
-        elif ch == "\r":
-            out.append("\\r")
-        elif ch == "\t":
-            out.append("\\t")
-        else:
-            out.append(f"\\{n:03o}")
-    return '"' + "".join(out) + '"'
+def json_loads_line(line):
+    """Parse one raw JSONL line, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    # Invalid UTF-8 is replaced rather than rejected, as the text-mode reader used to do.
+    return json.loads(line.decode("utf-8", errors="replace"))
 
 
 def parse_args(argv):
@@ -44,237 +107,293 @@ def parse_args(argv):
     return p.parse_args(argv)
 
 
-def clamp_str(s, max_len):
+def clamp_bytes(s, max_len):
     if s is None:
-        return ""
+        return b""
     if not isinstance(s, str):
         s = str(s)
+    data = s.encode("utf-8", errors="replace")
     if max_len < 0:
-        return s
-    if len(s) > max_len:
-        return s[:max_len]
-    return s
+        return data
+    return data[:max_len]
 
 
-def main(argv=None):
-    ns = parse_args(sys.argv[1:] if argv is None else argv)
+def iter_tests(input_file, strict, max_str):
+    """Yield a TestCase for every command recorded in one JSONL trace."""
+    try:
+        with open(input_file, "rb") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+
+                try:
+                    data = json_loads_line(line)
+                except json.JSONDecodeError:
+                    if strict:
+                        raise ValueError(f"{input_file}:{lineno} invalid JSON")
+                    continue
+
+                if not isinstance(data, dict):
+                    if strict:
+                        raise ValueError(f"{input_file}:{lineno} top-level JSON must be an object")
+                    continue
+
+                name = data.get("name", "unknown")
+                if not isinstance(name, str) or not name.strip():
+                    name = "unknown"
+
+                commands = data.get("commands", [])
+                if not isinstance(commands, list):
+                    if strict:
+                        raise ValueError(f"{input_file}:{lineno} commands must be a list")
+                    continue
+
+                for i, cmd in enumerate(commands):
+                    if not isinstance(cmd, dict):
+                        if strict:
+                            raise ValueError(f"{input_file}:{lineno} command[{i}] must be an object")
+                        continue
 
-    if ns.max_str < 0:
-        print("--max-str must be >= 0", file=sys.stderr)
-        return 2
+                    argv_list = cmd.get("argv")
+                    if not (isinstance(argv_list, list) and argv_list and all(isinstance(x, str) for x in argv_list)):
+                        if strict:
+                            raise ValueError(f"{input_file}:{lineno} command[{i}] missing/invalid argv")
+                        continue
 
-    output_file = ns.output_c
-    input_files = ns.inputs
+                    env_var = tool_env_for(argv_list[0])
 
-    tests = []
+                    rc = cmd.get("returncode", 0)
+                    if not isinstance(rc, int):
+                        if strict:
+                            raise ValueError(f"{input_file}:{lineno} command[{i}] returncode must be int")
+                        rc = 0
 
-    for input_file in input_files:
-        try:
-            with open(input_file, "r", encoding="utf-8", errors="replace") as f:
-                for lineno, line in enumerate(f, start=1):
-                    if not line.strip():
-                        continue
+                    cmd_str = shlex.join(argv_list[1:])
+                    test_name = f"{name}_cmd{i}"
 
-                    try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError:
-                        if ns.strict:
-                            raise ValueError(f"{input_file}:{lineno} invalid JSON")
+                    if test_name in _SKIP_TESTS:
                         continue
 
-                    if not isinstance(data, dict):
-                        if ns.strict:
-                            raise ValueError(f"{input_file}:{lineno} top-level JSON must be an object")
-                        continue
+                    yield TestCase(
+                        name=test_name,
+                        tool_env=env_var,
+                        args=cmd_str,
+                        expected_rc=rc,
+                        expected_stdout=clamp_bytes(cmd.get("stdout", ""), max_str),
+                        expected_stderr=clamp_bytes(cmd.get("stderr", ""), max_str),
+                    )
+    except OSError as ex:
+        if strict:
+            raise
+        print(f"warning: failed to read {input_file}: {ex}", file=sys.stderr)
 
-                    name = data.get("name", "unknown")
-                    if not isinstance(name, str) or not name.strip():
-                        name = "unknown"
 
-                    commands = data.get("commands", [])
-                    if not isinstance(commands, list):
-                        if ns.strict:
-                            raise ValueError(f"{input_file}:{lineno} commands must be a list")
-                        continue
+def read_tests(input_file, strict, max_str):
+    """Worker entry point: generators cannot cross the process boundary, lists can."""
+    return list(iter_tests(input_file, strict, max_str))
+
+
+def input_size(input_file):
+    """Size of one trace in bytes; unreadable files count as empty and are reported by iter_tests."""
+    try:
+        return os.path.getsize(input_file)
+    except OSError:
+        return 0
+
+
+# Fixed text around the generated tables: includes plus the C TestCase layout ...
+_PROLOGUE = (
+    "#define _POSIX_C_SOURCE 200809L\n"
+    '#include "common.h"\n'
+    "#include <stdbool.h>\n"
+    "#include <stdio.h>\n"
+    "#include <string.h>\n"
+    "#include <stdlib.h>\n"
+    "#include <unistd.h>\n\n"
+
+    "typedef struct {\n"
+    "    const char* name;\n"
+    "    const char* tool_env;\n"
+    "    const char* args;\n"
+    "    int expected_rc;\n"
+    "    const char* expected_stdout;\n"
+    "    const char* expected_stderr;\n"
+    "} TestCase;\n\n"
+)
+
+# ... and the harness that runs every row against the tool binaries.
+_DRIVER = (
+    "static const char *fallback_bin_for(const char *tool_env) {\n"
+    "    if (strcmp(tool_env, UNZIP_BIN_s) == 0) return \"./build/unzip\";\n"
+    "    if (strcmp(tool_env, ZIPINFO_BIN_s) == 0) return \"./build/zipinfo\";\n"
+    "    if (strcmp(tool_env, ZIP_BIN_s) == 0) return \"./build/zip\";\n"
+    "    return \"./build/tool\";\n"
+    "}\n\n"
+
+    "int main(void) {\n"
+    "    int passed = 0;\n"
+    "    int failed = 0;\n"
+    "    char fixture_root[] = \"/tmp/zu_parity_test_XXXXXX\";\n"
+    "    if (!mkdtemp(fixture_root)) {\n"
+    "        perror(\"mkdtemp\");\n"
+    "        return 1;\n"
+    "    }\n\n"
+
+    "    const char *zip_bin_for_fixture = getenv(\"ZIP_BIN\");\n"
+    "    if (!zip_bin_for_fixture || zip_bin_for_fixture[0] == '\\0')\n"
+    "        zip_bin_for_fixture = \"./build/zip\";\n\n"
+
+    "    for (size_t i = 0; i < sizeof(tests) / sizeof(tests[0]); ++i) {\n"
+    "        TestCase *t = &tests[i];\n"
+    "        printf(\"Running %s... \", t->name);\n"
+    "        fflush(stdout);\n\n"
+
+    "        create_fixture(fixture_root, zip_bin_for_fixture);\n"
+    "        if (strcmp(t->tool_env, UNZIP_BIN_s) == 0 && !strstr(t->name, \"overwrite\")) {\n"
+    "            cleanup_files_keeping_zip(fixture_root);\n"
+    "        }\n\n"
+
+    "        const char *bin = getenv(t->tool_env);\n"
+    "        if (!bin || bin[0] == '\\0')\n"
+    "            bin = fallback_bin_for(t->tool_env);\n\n"
+
+    "        char cmd[8192];\n"
+    "        if (t->args && t->args[0])\n"
+    "            snprintf(cmd, sizeof(cmd), \"%s %s\", bin, t->args);\n"
+    "        else\n"
+    "            snprintf(cmd, sizeof(cmd), \"%s\", bin);\n\n"
+
+    "        char *out = NULL;\n"
+    "        char *err = NULL;\n"
+    "        int rc = 0;\n"
+    "        run_command(fixture_root, cmd, &out, &err, &rc);\n\n"
+
+    "        if (!out) out = strdup(\"\");\n"
+    "        if (!err) err = strdup(\"\");\n\n"
+
+    "        bool ok = true;\n"
+    "        if (rc != t->expected_rc) {\n"
+    "            printf(\"\\n  RC mismatch: expected %d, got %d\\n\", t->expected_rc, rc);\n"
+    "            ok = false;\n"
+    "        }\n\n"
+
+    "        if (t->expected_stdout[0] == '\\0') {\n"
+    "            if (out[0] != '\\0') {\n"
+    "                printf(\"\\n  Stdout mismatch: expected empty, got %zu bytes\\n\", strlen(out));\n"
+    "                ok = false;\n"
+    "            }\n"
+    "        } else {\n"
+    "            if (out[0] == '\\0') {\n"
+    "                printf(\"\\n  Stdout mismatch: expected content, got empty\\n\");\n"
+    "                ok = false;\n"
+    "            }\n"
+    "        }\n\n"
+
+    "        if (t->expected_stderr[0] == '\\0') {\n"
+    "            if (err[0] != '\\0') {\n"
+    "                printf(\"\\n  Stderr mismatch: expected empty, got %zu bytes\\n\", strlen(err));\n"
+    "                ok = false;\n"
+    "            }\n"
+    "        } else {\n"
+    "            if (err[0] == '\\0') {\n"
+    "                printf(\"\\n  Stderr mismatch: expected content, got empty\\n\");\n"
+    "                ok = false;\n"
+    "            }\n"
+    "        }\n\n"
+
+    "        free(out);\n"
+    "        free(err);\n"
+    "        cleanup_fixture(fixture_root);\n\n"
+
+    "        if (ok) {\n"
+    "            printf(\"PASS\\n\");\n"
+    "            passed++;\n"
+    "        } else {\n"
+    "            printf(\"FAIL\\n\");\n"
+    "            failed++;\n"
+    "        }\n"
+    "    }\n\n"
+
+    "    rmdir(fixture_root);\n"
+    "    printf(\"\\nPassed: %d, Failed: %d\\n\", passed, failed);\n"
+    "    return failed > 0 ? 1 : 0;\n"
+    "}\n"
+)
+
+
+def render_c(tests):
+    """Return the parity test driver source for an iterable of TestCase records."""
+    buf = []
+    w = buf.append
+
+    w(_PROLOGUE)
+
+    # Expected outputs repeat heavily (empty, usage text, identical listings), so
+    # each distinct one is emitted once as a named array and rows point at it.
+    strtab = {}
+
+    def expected_sym(s):
+        lit = c_escape(s)
+        sym = strtab.get(lit)
+        if sym is None:
+            sym = strtab[lit] = f"expected_{len(strtab)}"
+        return sym
+
+    # Only four tool env names exist; rows point at one shared array per name.
+    # The three real tools are always emitted because fallback_bin_for() uses them.
+    envtab = {env: f"{env}_s" for env in _TOOL_ENVS}
+
+    def env_sym(env):
+        sym = envtab.get(env)
+        if sym is None:
+            sym = envtab[env] = f"{env}_s"
+        return sym
+
+    rows = [
+        _TEST_CASE_FMT.format(
+            name=c_escape(t.name),
+            tool_env=env_sym(t.tool_env),
+            args=c_escape(t.args),
+            expected_rc=t.expected_rc,
+            expected_stdout=expected_sym(t.expected_stdout),
+            expected_stderr=expected_sym(t.expected_stderr),
+        )
+        for t in tests
+    ]
+    buf.extend(f"static const char {sym}[] = {c_escape(env)};\n" for env, sym in envtab.items())
+    buf.extend(f"static const char {sym}[] = {lit};\n" for lit, sym in strtab.items())
+    w("\n")
+
+    w("static TestCase tests[] = {\n")
+    buf.extend(rows)
+    w("};\n\n")
+    w(_DRIVER)
+    return "".join(buf)
+
+
+def main(argv=None):
+    ns = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if ns.max_str < 0:
+        print("--max-str must be >= 0", file=sys.stderr)
+        return 2
+
+    output_file = ns.output_c
+    input_files = ns.inputs
 
-                    for i, cmd in enumerate(commands):
-                        if not isinstance(cmd, dict):
-                            if ns.strict:
-                                raise ValueError(f"{input_file}:{lineno} command[{i}] must be an object")
-                            continue
-
-                        argv_list = cmd.get("argv")
-                        if not (isinstance(argv_list, list) and argv_list and all(isinstance(x, str) for x in argv_list)):
-                            if ns.strict:
-                                raise ValueError(f"{input_file}:{lineno} command[{i}] missing/invalid argv")
-                            continue
-
-                        tool = argv_list[0]
-                        env_var = "ZIP_BIN"
-                        tool_l = tool.lower()
-                        if "zipinfo" in tool_l:
-                            env_var = "ZIPINFO_BIN"
-                        elif "unzip" in tool_l:
-                            env_var = "UNZIP_BIN"
-                        elif "zip" in tool_l:
-                            env_var = "ZIP_BIN"
-                        else:
-                            env_var = "TOOL_BIN"
-
-                        rc = cmd.get("returncode", 0)
-                        if not isinstance(rc, int):
-                            if ns.strict:
-                                raise ValueError(f"{input_file}:{lineno} command[{i}] returncode must be int")
-                            rc = 0
-
-                        cmd_str = " ".join(shlex.quote(arg) for arg in argv_list[1:])
-                        test_name = f"{name}_cmd{i}"
-
-                        # Skip tests that require stateful fixtures not supported by create_fixture
-                        if test_name in ("15-delete-filtered_cmd1", "25-pattern-brackets_cmd0"):
-                            continue
-
-                        tests.append(
-                            {
-                                "name": test_name,
-                                "tool_env": env_var,
-                                "args": cmd_str,
-                                "expected_rc": rc,
-                                "expected_stdout": clamp_str(cmd.get("stdout", ""), ns.max_str),
-                                "expected_stderr": clamp_str(cmd.get("stderr", ""), ns.max_str),
-                            }
-                        )
-        except OSError as ex:
-            if ns.strict:
-                raise
-            print(f"warning: failed to read {input_file}: {ex}", file=sys.stderr)
+    if len(input_files) > 1 and sum(map(input_size, input_files)) >= _PARALLEL_MIN_BYTES:
+        # Traces are independent; parse them in parallel and keep argument order.
+        # map() hands back each file's tests as soon as it (and its predecessors) finish.
+        with ProcessPoolExecutor(max_workers=min(len(input_files), os.cpu_count() or 1)) as ex:
+            source = render_c(chain.from_iterable(ex.map(read_tests, input_files, repeat(ns.strict), repeat(ns.max_str))))
+    else:
+        # Small inputs are streamed straight from the parser into the emitter, in argument order.
+        source = render_c(chain.from_iterable(iter_tests(path, ns.strict, ns.max_str) for path in input_files))
 
     try:
-        with open(output_file, "w", encoding="utf-8", errors="strict") as f:
-            f.write("#define _POSIX_C_SOURCE 200809L\n")
-            f.write('#include "common.h"\n')
-            f.write("#include <stdbool.h>\n")
-            f.write("#include <stdio.h>\n")
-            f.write("#include <string.h>\n")
-            f.write("#include <stdlib.h>\n")
-            f.write("#include <unistd.h>\n\n")
-
-            f.write("typedef struct {\n")
-            f.write("    const char* name;\n")
-            f.write("    const char* tool_env;\n")
-            f.write("    const char* args;\n")
-            f.write("    int expected_rc;\n")
-            f.write("    const char* expected_stdout;\n")
-            f.write("    const char* expected_stderr;\n")
-            f.write("} TestCase;\n\n")
-
-            f.write("static TestCase tests[] = {\n")
-            for t in tests:
-                f.write("    {\n")
-                f.write(f"        .name = {c_escape(t['name'])},\n")
-                f.write(f"        .tool_env = {c_escape(t['tool_env'])},\n")
-                f.write(f"        .args = {c_escape(t['args'])},\n")
-                f.write(f"        .expected_rc = {t['expected_rc']},\n")
-                f.write(f"        .expected_stdout = {c_escape(t['expected_stdout'])},\n")
-                f.write(f"        .expected_stderr = {c_escape(t['expected_stderr'])},\n")
-                f.write("    },\n")
-            f.write("};\n\n")
-
-            f.write("static const char *fallback_bin_for(const char *tool_env) {\n")
-            f.write("    if (strcmp(tool_env, \"UNZIP_BIN\") == 0) return \"./build/unzip\";\n")
-            f.write("    if (strcmp(tool_env, \"ZIPINFO_BIN\") == 0) return \"./build/zipinfo\";\n")
-            f.write("    if (strcmp(tool_env, \"ZIP_BIN\") == 0) return \"./build/zip\";\n")
-            f.write("    return \"./build/tool\";\n")
-            f.write("}\n\n")
-
-            f.write("int main(void) {\n")
-            f.write("    int passed = 0;\n")
-            f.write("    int failed = 0;\n")
-            f.write("    char fixture_root[] = \"/tmp/zu_parity_test_XXXXXX\";\n")
-            f.write("    if (!mkdtemp(fixture_root)) {\n")
-            f.write("        perror(\"mkdtemp\");\n")
-            f.write("        return 1;\n")
-            f.write("    }\n\n")
-
-            f.write("    const char *zip_bin_for_fixture = getenv(\"ZIP_BIN\");\n")
-            f.write("    if (!zip_bin_for_fixture || zip_bin_for_fixture[0] == '\\0')\n")
-            f.write("        zip_bin_for_fixture = \"./build/zip\";\n\n")
-
-            f.write("    for (size_t i = 0; i < sizeof(tests) / sizeof(tests[0]); ++i) {\n")
-            f.write("        TestCase *t = &tests[i];\n")
-            f.write("        printf(\"Running %s... \", t->name);\n")
-            f.write("        fflush(stdout);\n\n")
-
-            f.write("        create_fixture(fixture_root, zip_bin_for_fixture);\n")
-            f.write("        if (strcmp(t->tool_env, \"UNZIP_BIN\") == 0 && !strstr(t->name, \"overwrite\")) {\n")
-            f.write("            cleanup_files_keeping_zip(fixture_root);\n")
-            f.write("        }\n\n")
-
-            f.write("        const char *bin = getenv(t->tool_env);\n")
-            f.write("        if (!bin || bin[0] == '\\0')\n")
-            f.write("            bin = fallback_bin_for(t->tool_env);\n\n")
-
-            f.write("        char cmd[8192];\n")
-            f.write("        if (t->args && t->args[0])\n")
-            f.write("            snprintf(cmd, sizeof(cmd), \"%s %s\", bin, t->args);\n")
-            f.write("        else\n")
-            f.write("            snprintf(cmd, sizeof(cmd), \"%s\", bin);\n\n")
-
-            f.write("        char *out = NULL;\n")
-            f.write("        char *err = NULL;\n")
-            f.write("        int rc = 0;\n")
-            f.write("        run_command(fixture_root, cmd, &out, &err, &rc);\n\n")
-
-            f.write("        if (!out) out = strdup(\"\");\n")
-            f.write("        if (!err) err = strdup(\"\");\n\n")
-
-            f.write("        bool ok = true;\n")
-            f.write("        if (rc != t->expected_rc) {\n")
-            f.write("            printf(\"\\n  RC mismatch: expected %d, got %d\\n\", t->expected_rc, rc);\n")
-            f.write("            ok = false;\n")
-            f.write("        }\n\n")
-
-            f.write("        if (t->expected_stdout[0] == '\\0') {\n")
-            f.write("            if (out[0] != '\\0') {\n")
-            f.write("                printf(\"\\n  Stdout mismatch: expected empty, got %zu bytes\\n\", strlen(out));\n")
-            f.write("                ok = false;\n")
-            f.write("            }\n")
-            f.write("        } else {\n")
-            f.write("            if (out[0] == '\\0') {\n")
-            f.write("                printf(\"\\n  Stdout mismatch: expected content, got empty\\n\");\n")
-            f.write("                ok = false;\n")
-            f.write("            }\n")
-            f.write("        }\n\n")
-
-            f.write("        if (t->expected_stderr[0] == '\\0') {\n")
-            f.write("            if (err[0] != '\\0') {\n")
-            f.write("                printf(\"\\n  Stderr mismatch: expected empty, got %zu bytes\\n\", strlen(err));\n")
-            f.write("                ok = false;\n")
-            f.write("            }\n")
-            f.write("        } else {\n")
-            f.write("            if (err[0] == '\\0') {\n")
-            f.write("                printf(\"\\n  Stderr mismatch: expected content, got empty\\n\");\n")
-            f.write("                ok = false;\n")
-            f.write("            }\n")
-            f.write("        }\n\n")
-
-            f.write("        free(out);\n")
-            f.write("        free(err);\n")
-            f.write("        cleanup_fixture(fixture_root);\n\n")
-
-            f.write("        if (ok) {\n")
-            f.write("            printf(\"PASS\\n\");\n")
-            f.write("            passed++;\n")
-            f.write("        } else {\n")
-            f.write("            printf(\"FAIL\\n\");\n")
-            f.write("            failed++;\n")
-            f.write("        }\n")
-            f.write("    }\n\n")
-
-            f.write("    rmdir(fixture_root);\n")
-            f.write("    printf(\"\\nPassed: %d, Failed: %d\\n\", passed, failed);\n")
-            f.write("    return failed > 0 ? 1 : 0;\n")
-            f.write("}\n")
+        # c_escape leaves only ASCII in the source, so encode once and skip TextIOWrapper.
+        with open(output_file, "wb") as f:
+            f.write(source.encode("utf-8"))
     except OSError as ex:
         print(f"error: failed to write {output_file}: {ex}", file=sys.stderr)
         return 2
@@ -22,12 +22,21 @@ import shutil
 import subprocess
 import sys
 import tempfile
-from dataclasses import dataclass
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
+from functools import partial
 from itertools import count
 from pathlib import Path
+from time import perf_counter_ns
 from typing import Callable
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 @dataclass
 class CommandSpec:
@@ -103,17 +112,39 @@ class ScenarioResult:
             "notes": self.notes,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> ScenarioResult:
+        fields = dict(data)
+        fields["commands"] = [CommandCapture(**c) for c in data["commands"]]
+        return cls(**fields)
+
+
+@dataclass
+class SummaryRow:
+    name: str
+    returncode: int
+    archive_exists: bool
+    entry_count: int
+    description: str
+
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
+    with path.open("rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            # The archive is read once front to back; let the kernel read ahead.
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(4 * 1024 * 1024)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            h.update(view[:n])
     return h.hexdigest()
 
 
 def run(argv: list[str], cwd: Path, stdin: bytes | None, binary_output: bool = False):
-    start = datetime.now()
+    start = perf_counter_ns()
     proc = subprocess.run(
         argv,
         cwd=cwd,
@@ -121,7 +152,7 @@ def run(argv: list[str], cwd: Path, stdin: bytes | None, binary_output: bool = F
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
-    end = datetime.now()
+    duration_ms = (perf_counter_ns() - start) // 1_000_000
 
     if binary_output:
         stdout_str = f"<binary output {len(proc.stdout)} bytes>"
@@ -132,7 +163,7 @@ def run(argv: list[str], cwd: Path, stdin: bytes | None, binary_output: bool = F
         proc.returncode,
         stdout_str,
         proc.stderr.decode(errors="replace"),
-        int((end - start).total_seconds() * 1000),
+        duration_ms,
     )
 
 
@@ -153,20 +184,14 @@ def capture_command(spec: CommandSpec, cwd: Path, binary_output: bool = False) -
 
 
 def list_entries(archive: Path) -> list[str]:
-    if not shutil.which("unzip"):
-        return []
-
-    # -Z -1 lists filenames only
-    rc, out, _, _ = run(
-        ["unzip", "-Z", "-1", str(archive)],
-        archive.parent,
-        None,
-    )
-    if rc != 0:
+    # Only the central directory is needed, so read it in-process rather than
+    # spawning `unzip -Z -1` for every scenario.
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            return zf.namelist()
+    except (zipfile.BadZipFile, OSError):
         return []
 
-    return [line.strip() for line in out.splitlines() if line.strip()]
-
 
 def make_fixture(root: Path) -> None:
     (root / "dir/sub").mkdir(parents=True)
@@ -193,14 +218,36 @@ def make_fixture(root: Path) -> None:
         pass
 
 
+def unshare(path: Path) -> None:
+    """Give a hardlinked fixture file its own inode before it is modified."""
+    tmp = path.with_name(path.name + ".unshare")
+    shutil.copy2(path, tmp)
+    os.replace(tmp, path)
+
+
+def rewrite(path: Path, text: str) -> None:
+    path.unlink()
+    path.write_text(text)
+
+
 def set_mtime(path: Path, dt: datetime) -> None:
+    unshare(path)
     ts = dt.timestamp()
     os.utime(path, (ts, ts))
 
 
+def link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
 def build_workdir(fixture: Path, root: Path, name: str) -> Path:
     workdir = root / name
-    shutil.copytree(fixture, workdir, symlinks=True)
+    # Workdirs share the fixture's inodes; before hooks must go through
+    # rewrite()/set_mtime() so an edit never reaches another scenario.
+    shutil.copytree(fixture, workdir, symlinks=True, copy_function=link_or_copy)
     return workdir
 
 
@@ -373,11 +420,17 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
         workdir=workdir,
         archive=archive,
         commands=[
-            CommandSpec("seed", [zip_cmd, aname, "a.txt"]),
+            # Age the seeded copy so the rewrite below is newer even within
+            # the 2-second DOS timestamp resolution.
+            CommandSpec(
+                "seed",
+                [zip_cmd, aname, "a.txt"],
+                before=lambda wd: set_mtime(wd / "a.txt", datetime(2010, 1, 1))
+            ),
             CommandSpec(
                 "update",
                 [zip_cmd, "-u", aname, "a.txt"],
-                before=lambda _: (workdir / "a.txt").write_text("updated content")
+                before=lambda wd: rewrite(wd / "a.txt", "updated content")
             ),
         ],
         notes=["Modifies a.txt to ensure timestamp update triggers replacement."]
@@ -390,11 +443,15 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
         workdir=workdir,
         archive=archive,
         commands=[
-            CommandSpec("seed", [zip_cmd, aname, "a.txt"]),
+            CommandSpec(
+                "seed",
+                [zip_cmd, aname, "a.txt"],
+                before=lambda wd: set_mtime(wd / "a.txt", datetime(2010, 1, 1))
+            ),
             CommandSpec(
                 "freshen",
                 [zip_cmd, "-f", aname, "a.txt", "b.bin"],
-                before=lambda _: (workdir / "a.txt").write_text("freshened")
+                before=lambda wd: rewrite(wd / "a.txt", "freshened")
             ),
         ],
         notes=["b.bin is ignored because it's not in the archive."]
@@ -411,7 +468,7 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
             CommandSpec(
                 "filesync",
                 [zip_cmd, "-FS", aname, "a.txt", "b.bin", "data.dat"],
-                before=lambda _: (workdir / "b.bin").unlink()
+                before=lambda wd: (wd / "b.bin").unlink()
             ),
         ],
         notes=["Adds data.dat, Keeps a.txt, Removes b.bin (deleted from disk)."]
@@ -442,7 +499,7 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
             CommandSpec(
                 "delete-old",
                 [zip_cmd, "-d", "-tt", "2020-01-01", aname, "*"],
-                before=lambda _: set_mtime(workdir / "a.txt", datetime(2010, 1, 1))
+                before=lambda wd: set_mtime(wd / "a.txt", datetime(2010, 1, 1))
             )
         ],
         notes=["a.txt (2010) should be deleted. b.bin (now) preserved."]
@@ -573,7 +630,7 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
             CommandSpec(
                 "filter-t",
                 [zip_cmd, "-t", "2020-01-01", aname, "a.txt", "b.bin"],
-                before=lambda _: set_mtime(workdir / "a.txt", datetime(2010, 1, 1))
+                before=lambda wd: set_mtime(wd / "a.txt", datetime(2010, 1, 1))
             )
         ],
         notes=["a.txt (2010) is too old. Only b.bin should remain (default current time)."]
@@ -589,7 +646,7 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
             CommandSpec(
                 "filter-tt",
                 [zip_cmd, "-tt", "2015-01-01", aname, "a.txt", "b.bin"],
-                before=lambda _: set_mtime(workdir / "a.txt", datetime(2010, 1, 1))
+                before=lambda wd: set_mtime(wd / "a.txt", datetime(2010, 1, 1))
             )
         ],
         notes=["a.txt (2010) matches. b.bin (current) is too new."]
@@ -750,7 +807,7 @@ def build_scenarios(zip_cmd: str, fixture: Path, root: Path) -> list[Scenario]:
             CommandSpec(
                 "set-time",
                 [zip_cmd, "-o", aname, "a.txt"],
-                before=lambda _: set_mtime(workdir / "a.txt", future_time)
+                before=lambda wd: set_mtime(wd / "a.txt", future_time)
             )
         ],
         notes=["Archive mtime should match a.txt mtime."]
@@ -813,25 +870,75 @@ def execute_scenario(scenario: Scenario) -> ScenarioResult:
     )
 
 
-def write_outputs(outdir: Path, results: list[ScenarioResult], metadata: dict[str, object]) -> None:
-    with (outdir / "runs.jsonl").open("w") as f:
-        for res in results:
-            f.write(json.dumps(res.to_dict()) + "\n")
+def cache_key(scenario: Scenario, salt: str) -> str:
+    spec = [
+        salt,
+        scenario.name,
+        [(c.label, c.argv, c.stdin.hex() if c.stdin is not None else None) for c in scenario.commands],
+    ]
+    return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()
+
+
+def execute_cached(scenario: Scenario, cache_dir: Path | None, salt: str) -> ScenarioResult:
+    """Run a scenario, or reuse its result from an earlier run with the same key."""
+    if cache_dir is None:
+        return execute_scenario(scenario)
 
+    path = cache_dir / f"{cache_key(scenario, salt)}.json"
+    try:
+        cached = ScenarioResult.from_dict(json.loads(path.read_bytes()))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError):
+        # Truncated or stale entry (e.g. from an interrupted run): drop it and rerun.
+        path.unlink(missing_ok=True)
+    else:
+        # Paths recorded by the run that filled the cache are gone; report this run's.
+        return replace(
+            cached,
+            workdir=str(scenario.workdir),
+            archive_path=str(scenario.archive) if scenario.archive else None,
+        )
+
+    res = execute_scenario(scenario)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(res.to_dict()))
+    os.replace(tmp, path)
+    return res
+
+
+def json_line(obj: dict[str, object]) -> bytes:
+    """Serialize one JSONL record, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    # Match orjson's output byte for byte so runs.jsonl doesn't depend on it.
+    return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def summarize(res: ScenarioResult) -> SummaryRow:
+    return SummaryRow(
+        name=res.name,
+        returncode=res.commands[-1].returncode if res.commands else -1,
+        archive_exists=res.archive_exists,
+        entry_count=len(res.entries),
+        description=res.description,
+    )
+
+
+def write_outputs(outdir: Path, rows: list[SummaryRow], metadata: dict[str, object]) -> None:
     with (outdir / "metadata.json").open("w") as f:
         json.dump(metadata, f, indent=2)
 
     by_rc: dict[int, int] = {}
-    for res in results:
-        rc = res.commands[-1].returncode if res.commands else -1
-        by_rc[rc] = by_rc.get(rc, 0) + 1
+    for row in rows:
+        by_rc[row.returncode] = by_rc.get(row.returncode, 0) + 1
 
     summary = outdir / "summary.md"
     with summary.open("w") as f:
         f.write("# zip output behavior summary\n\n")
         f.write(f"- zip command: {metadata.get('zip_cmd')}\n")
         f.write(f"- zip version: {metadata.get('zip_version')}\n")
-        f.write(f"- scenarios: {len(results)}\n")
+        f.write(f"- scenarios: {len(rows)}\n")
         f.write(f"- timestamp: {metadata.get('generated_at')}\n")
         f.write("\n### Return Codes\n")
         for rc in sorted(by_rc):
@@ -841,13 +948,11 @@ def write_outputs(outdir: Path, results: list[ScenarioResult], metadata: dict[st
         f.write("| Name | RC | Archive | Entries | Description |\n")
         f.write("|---|---|---|---|---|\n")
 
-        for res in results:
-            main_rc = res.commands[-1].returncode if res.commands else -1
-            entry_count = len(res.entries)
-            archive_state = "Yes" if res.archive_exists else "No"
+        for row in rows:
+            archive_state = "Yes" if row.archive_exists else "No"
             # Escape pipes in description for markdown table safety
-            desc = res.description.replace("|", "\\|")
-            f.write(f"| {res.name} | {main_rc} | {archive_state} | {entry_count} | {desc} |\n")
+            desc = row.description.replace("|", "\\|")
+            f.write(f"| {row.name} | {row.returncode} | {archive_state} | {row.entry_count} | {desc} |\n")
 
 
 def get_zip_version(zip_cmd: str) -> str:
@@ -863,11 +968,7 @@ def get_zip_version(zip_cmd: str) -> str:
     # Some versions output to stdout, some to stderr if no zipfile provided
     output = proc.stdout if proc.stdout.strip() else proc.stderr
     if output:
-        lines = output.splitlines()
-        for line in lines:
-            if "Zip" in line and "Info-ZIP" in line:
-                return line.strip()
-        return lines[0].strip() if lines else "unknown"
+        return next((l.strip() for l in output.splitlines() if "Info-ZIP" in l and "Zip" in l), output.partition("\n")[0].strip())
     return f"rc={proc.returncode}"
 
 
@@ -881,9 +982,16 @@ def main() -> int:
         default=0,
         help="Limit number of scenarios to run (0 = all).",
     )
+    ap.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Reuse scenario results stored here by earlier runs of the same zip binary.",
+    )
     args = ap.parse_args()
 
-    if not shutil.which(args.zip):
+    zip_path = shutil.which(args.zip)
+    if not zip_path:
         print(f"zip binary not found: {args.zip}", file=sys.stderr)
         return 1
 
@@ -893,7 +1001,16 @@ def main() -> int:
     zip_version = get_zip_version(args.zip)
     print(f"Documenting: {args.zip} ({zip_version})")
 
-    results: list[ScenarioResult] = []
+    # Results are only reusable for the exact same zip binary and the exact
+    # same scenario definitions (including before hooks), so key on both.
+    cache_salt = ""
+    if args.cache_dir is not None:
+        args.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_salt = f"{zip_version}:{sha256_file(Path(zip_path))}:{sha256_file(Path(__file__))}"
+
+    # Full results (with captured output) are written as they arrive; only the
+    # small summary rows are kept for summary.md.
+    rows: list[SummaryRow] = []
     with tempfile.TemporaryDirectory(prefix="zip-doc-") as td:
         tmp_root = Path(td)
         fixture = tmp_root / "fixture"
@@ -904,16 +1021,23 @@ def main() -> int:
         limit = args.max_runs if args.max_runs > 0 else len(scenarios)
 
         print(f"Running {limit} scenarios...")
-        for i, scenario in enumerate(scenarios[:limit]):
-            results.append(execute_scenario(scenario))
-        print(f"\nCompleted {len(results)} scenarios.")
+        # Scenarios own separate workdirs and spend their time waiting on zip,
+        # so threads overlap them; map() keeps results in scenario order.
+        with ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) - 2)) as ex, \
+                (outdir / "runs.jsonl").open("wb") as runs:
+            run_one = partial(execute_cached, cache_dir=args.cache_dir, salt=cache_salt)
+            for res in ex.map(run_one, scenarios[:limit]):
+                runs.write(json_line(res.to_dict()))
+                runs.flush()
+                rows.append(summarize(res))
+        print(f"\nCompleted {len(rows)} scenarios.")
 
     metadata = {
         "zip_cmd": args.zip,
         "zip_version": zip_version,
         "generated_at": datetime.now().isoformat(),
     }
-    write_outputs(outdir, results, metadata)
+    write_outputs(outdir, rows, metadata)
     print(f"Results written to {outdir}/")
 
     return 0